@@ -1,14 +1,18 @@
 use serde::Deserialize;
 use serde_json::json;
-use std::fs;
-use std::path::PathBuf;
+use std::fs::{self, DirEntry, File, OpenOptions};
+use std::io::{self, Write};
+use std::path::{Path, PathBuf};
+use std::sync::Mutex;
+use std::time::SystemTime;
 
-use chrono::Utc;
+use chrono::{SecondsFormat, Utc};
 
 pub const DEFAULT_MEMORY: u64 = 100;
 pub const COLLECTION_CORE: &str = "ai.syui.gpt.core";
 pub const COLLECTION_MEMORY: &str = "ai.syui.gpt.memory";
 
+#[derive(Clone)]
 pub struct Config {
     pub path: Option<String>,
     pub did: Option<String>,
@@ -60,10 +64,32 @@ fn expand_path(p: &str) -> PathBuf {
     }
 }
 
+/// Last parsed config, keyed by the file's (mtime, len)
+static LOAD_CACHE: Mutex<Option<((SystemTime, u64), Config)>> = Mutex::new(None);
+
 pub fn load() -> Config {
     let cfg_path = config_file();
-    if let Ok(content) = fs::read_to_string(&cfg_path) {
-        if let Ok(file) = serde_json::from_str::<ConfigFile>(&content) {
+    let stamp = fs::metadata(&cfg_path)
+        .ok()
+        .and_then(|m| Some((m.modified().ok()?, m.len())));
+    let Some(stamp) = stamp else {
+        return parse(&cfg_path);
+    };
+
+    let mut cache = LOAD_CACHE.lock().unwrap_or_else(|e| e.into_inner());
+    if let Some((cached_stamp, cfg)) = cache.as_ref() {
+        if *cached_stamp == stamp {
+            return cfg.clone();
+        }
+    }
+    let cfg = parse(&cfg_path);
+    *cache = Some((stamp, cfg.clone()));
+    cfg
+}
+
+fn parse(cfg_path: &Path) -> Config {
+    if let Ok(content) = fs::read(cfg_path) {
+        if let Ok(file) = serde_json::from_slice::<ConfigFile>(&content) {
             if let Some(bot) = file.bot {
                 return Config {
                     path: bot.path,
@@ -101,11 +127,7 @@ pub fn init() {
 
     let cfg = load();
     let core_path = record_path(&cfg, COLLECTION_CORE, "self");
-    if !core_path.exists() {
-        if let Some(parent) = core_path.parent() {
-            let _ = fs::create_dir_all(parent);
-        }
-        let now = Utc::now().format("%Y-%m-%dT%H:%M:%SZ").to_string();
+    if let Ok(Some(mut file)) = create_new(&core_path) {
         let core_record = json!({
             "uri": format!("at://{}/{}/self", cfg.did(), COLLECTION_CORE),
             "value": {
@@ -116,16 +138,38 @@ pub fn init() {
                     "$type": format!("{}#markdown", COLLECTION_CORE),
                     "text": ""
                 },
-                "createdAt": now
+                "createdAt": now()
             }
         });
-        let _ = fs::write(&core_path, serde_json::to_string_pretty(&core_record).unwrap());
+        let _ = file.write_all(serde_json::to_string_pretty(&core_record).unwrap().as_bytes());
     }
 
     let memory_dir = collection_dir(&cfg, COLLECTION_MEMORY);
     let _ = fs::create_dir_all(&memory_dir);
 }
 
+/// createdAt timestamp shared by core and memory records
+pub(crate) fn now() -> String {
+    Utc::now().to_rfc3339_opts(SecondsFormat::Secs, true)
+}
+
+/// Create `path` exclusively, creating parent dirs on demand.
+/// Returns `None` if the file already exists.
+fn create_new(path: &Path) -> io::Result<Option<File>> {
+    let open = || OpenOptions::new().write(true).create_new(true).open(path);
+    match open() {
+        Ok(file) => Ok(Some(file)),
+        Err(e) if e.kind() == io::ErrorKind::AlreadyExists => Ok(None),
+        Err(e) if e.kind() == io::ErrorKind::NotFound => {
+            if let Some(parent) = path.parent() {
+                fs::create_dir_all(parent)?;
+            }
+            open().map(Some)
+        }
+        Err(e) => Err(e),
+    }
+}
+
 pub fn base_dir(cfg: &Config) -> PathBuf {
     match &cfg.path {
         Some(p) => expand_path(p),
@@ -147,3 +191,10 @@ pub fn record_path(cfg: &Config, collection: &str, rkey: &str) -> PathBuf {
 pub fn collection_dir(cfg: &Config, collection: &str) -> PathBuf {
     base_dir(cfg).join(cfg.identity()).join(collection)
 }
+
+/// Whether a collection dir entry is a `{rkey}.json` record
+pub fn is_record(entry: &DirEntry) -> bool {
+    Path::new(&entry.file_name())
+        .extension()
+        .is_some_and(|ext| ext == "json")
+}
@@ -1,20 +1,52 @@
 use anyhow::{Context, Result};
+use serde::de::DeserializeOwned;
+use serde::Deserialize;
 use serde_json::Value;
 use std::fs;
+use std::path::{Path, PathBuf};
 
 use crate::core::config::{self, COLLECTION_CORE, COLLECTION_MEMORY};
 
+/// Only the markdown text of a record; other fields are skipped on parse
+#[derive(Default, Deserialize)]
+#[serde(default)]
+struct RecordText {
+    value: RecordValue,
+}
+
+#[derive(Default, Deserialize)]
+#[serde(default)]
+struct RecordValue {
+    content: RecordContent,
+}
+
+#[derive(Default, Deserialize)]
+#[serde(default)]
+struct RecordContent {
+    text: Option<String>,
+}
+
+pub fn read_record<T: DeserializeOwned>(path: &Path) -> Result<T> {
+    let content = fs::read(path)
+        .with_context(|| format!("Failed to read {}", path.display()))?;
+    serde_json::from_slice(&content)
+        .with_context(|| format!("Failed to parse {}", path.display()))
+}
+
 pub fn read_core() -> Result<Value> {
     let cfg = config::load();
-    let path = config::record_path(&cfg, COLLECTION_CORE, "self");
-    let content = fs::read_to_string(&path)
-        .with_context(|| format!("Failed to read {}", path.display()))?;
-    let record: Value = serde_json::from_str(&content)
-        .with_context(|| format!("Failed to parse {}", path.display()))?;
-    Ok(record)
+    read_record(&config::record_path(&cfg, COLLECTION_CORE, "self"))
 }
 
-pub fn read_memory_all() -> Result<Vec<Value>> {
+/// Core record text only
+pub fn read_core_text() -> Result<String> {
+    let cfg = config::load();
+    let record: RecordText = read_record(&config::record_path(&cfg, COLLECTION_CORE, "self"))?;
+    Ok(record.value.content.text.unwrap_or_default())
+}
+
+/// Memory record paths, sorted by rkey (TID order)
+pub fn memory_files() -> Result<Vec<PathBuf>> {
     let cfg = config::load();
     let dir = config::collection_dir(&cfg, COLLECTION_MEMORY);
     let entries = match fs::read_dir(&dir) {
@@ -24,20 +56,28 @@ pub fn read_memory_all() -> Result<Vec<Value>> {
     };
     let mut files: Vec<_> = entries
         .filter_map(|e| e.ok())
-        .filter(|e| e.path().extension().is_some_and(|ext| ext == "json"))
+        .filter(config::is_record)
         .collect();
-    files.sort_by_key(|e| e.file_name());
-
-    let mut records = Vec::with_capacity(files.len());
-    for entry in &files {
-        let path = entry.path();
-        let content = fs::read_to_string(&path)
-            .with_context(|| format!("Failed to read {}", path.display()))?;
-        let record: Value = serde_json::from_str(&content)
-            .with_context(|| format!("Failed to parse {}", path.display()))?;
-        records.push(record);
-    }
-    Ok(records)
+    files.sort_by_cached_key(|e| e.file_name());
+    Ok(files.iter().map(|e| e.path()).collect())
+}
+
+pub fn read_memory_all() -> Result<Vec<Value>> {
+    memory_files()?.iter().map(|path| read_record(path)).collect()
+}
+
+/// Memory record texts only, in TID order
+pub fn read_memory_texts() -> Result<Vec<String>> {
+    Ok(read_texts(&memory_files()?))
+}
+
+/// Records that fail to read or have no string text are skipped, not fatal
+fn read_texts(paths: &[PathBuf]) -> Vec<String> {
+    paths
+        .iter()
+        .filter_map(|path| read_record::<RecordText>(path).ok())
+        .filter_map(|r| r.value.content.text)
+        .collect()
 }
 
 pub fn memory_count() -> usize {
@@ -47,8 +87,38 @@ pub fn memory_count() -> usize {
         .map(|entries| {
             entries
                 .filter_map(|e| e.ok())
-                .filter(|e| e.path().extension().is_some_and(|ext| ext == "json"))
+                .filter(config::is_record)
                 .count()
         })
         .unwrap_or(0)
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn read_texts_skips_malformed_records() {
+        let dir = std::env::temp_dir().join(format!("aigpt-reader-{}", std::process::id()));
+        fs::create_dir_all(&dir).unwrap();
+        let records = [
+            ("1.json", r#"{"value":{"content":{"text":"good1"}}}"#),
+            ("2.json", r#"{"value":{"content":{"text":null}}}"#),
+            ("3.json", r#"{"value":{"content":{"text":42}}}"#),
+            ("4.json", r#"{"value":{"content":"not an object"}}"#),
+            ("5.json", r#"{"value":{"content":{"text":"good2"}}}"#),
+        ];
+        let paths: Vec<_> = records
+            .iter()
+            .map(|(name, body)| {
+                let path = dir.join(name);
+                fs::write(&path, body).unwrap();
+                path
+            })
+            .collect();
+
+        let texts = read_texts(&paths);
+        let _ = fs::remove_dir_all(&dir);
+        assert_eq!(texts, vec!["good1", "good2"]);
+    }
+}
@@ -1,7 +1,7 @@
 use anyhow::{Context, Result};
-use chrono::Utc;
 use serde_json::{json, Value};
 use std::fs;
+use std::path::Path;
 use std::sync::atomic::{AtomicU64, Ordering};
 use std::time::{SystemTime, UNIX_EPOCH};
 
@@ -25,8 +25,7 @@ fn generate_tid() -> String {
     tid
 }
 
-fn build_memory_record(did: &str, tid: &str, text: &str) -> Value {
-    let now = Utc::now().format("%Y-%m-%dT%H:%M:%SZ").to_string();
+fn build_memory_record(did: &str, tid: &str, text: &str, created_at: &str) -> Value {
     json!({
         "uri": format!("at://{}/{}/{}", did, COLLECTION_MEMORY, tid),
         "value": {
@@ -36,51 +35,97 @@ fn build_memory_record(did: &str, tid: &str, text: &str) -> Value {
                 "$type": format!("{}#markdown", COLLECTION_MEMORY),
                 "text": text
             },
-            "createdAt": now
+            "createdAt": created_at
         }
     })
 }
 
+/// Write a record via a temp file + rename so readers never see a partial file
+fn write_record(path: &Path, record: &Value) -> Result<()> {
+    let tmp = path.with_extension("json.tmp");
+    let json = serde_json::to_vec_pretty(record)?;
+    let result = fs::write(&tmp, json)
+        .with_context(|| format!("Failed to write {}", tmp.display()))
+        .and_then(|()| {
+            fs::rename(&tmp, path)
+                .with_context(|| format!("Failed to write {}", path.display()))
+        });
+    if result.is_err() {
+        let _ = fs::remove_file(&tmp);
+    }
+    result
+}
+
 /// Save a single memory element as a new TID file
 pub fn save_memory(content: &str) -> Result<()> {
     let cfg = config::load();
     let tid = generate_tid();
-    let record = build_memory_record(cfg.did(), &tid, content);
+    let record = build_memory_record(cfg.did(), &tid, content, &config::now());
 
     let dir = config::collection_dir(&cfg, COLLECTION_MEMORY);
     fs::create_dir_all(&dir)
         .with_context(|| format!("Failed to create {}", dir.display()))?;
-    let path = dir.join(format!("{}.json", tid));
-    let json_str = serde_json::to_string_pretty(&record)?;
-    fs::write(&path, json_str)
-        .with_context(|| format!("Failed to write {}", path.display()))
+    write_record(&dir.join(format!("{}.json", tid)), &record)
 }
 
-/// Delete all memory files, then write new ones from the given items
+/// Write new memory files from the given items, then delete all previous ones
 pub fn compress_memory(items: &[String]) -> Result<()> {
     let cfg = config::load();
     let dir = config::collection_dir(&cfg, COLLECTION_MEMORY);
 
-    // delete all existing memory files
-    if let Ok(entries) = fs::read_dir(&dir) {
-        for entry in entries.flatten() {
-            if entry.path().extension().is_some_and(|ext| ext == "json") {
-                let _ = fs::remove_file(entry.path());
-            }
-        }
-    }
+    let old_files: Vec<_> = fs::read_dir(&dir)
+        .map(|entries| {
+            entries
+                .flatten()
+                .filter(config::is_record)
+                .map(|e| e.path())
+                .collect()
+        })
+        .unwrap_or_default();
 
     fs::create_dir_all(&dir)
         .with_context(|| format!("Failed to create {}", dir.display()))?;
 
+    let created_at = config::now();
+    let mut new_files = Vec::with_capacity(items.len());
     for item in items {
         let tid = generate_tid();
-        let record = build_memory_record(cfg.did(), &tid, item);
+        let record = build_memory_record(cfg.did(), &tid, item, &created_at);
         let path = dir.join(format!("{}.json", tid));
-        let json_str = serde_json::to_string_pretty(&record)?;
-        fs::write(&path, json_str)
-            .with_context(|| format!("Failed to write {}", path.display()))?;
+        if let Err(e) = write_record(&path, &record) {
+            // roll back so the old set is left exactly as it was
+            for path in &new_files {
+                let _ = fs::remove_file(path);
+            }
+            return Err(e);
+        }
+        new_files.push(path);
+    }
+
+    // only drop the old set once the new one is fully on disk
+    for path in &old_files {
+        let _ = fs::remove_file(path);
     }
 
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn write_record_removes_tmp_on_failure() {
+        let dir = std::env::temp_dir().join(format!("aigpt-writer-{}", std::process::id()));
+        // a non-empty directory at the target path makes the rename fail
+        let path = dir.join("3aaaaaaaaaaaa.json");
+        fs::create_dir_all(path.join("blocker")).unwrap();
+
+        let record = build_memory_record("self", "3aaaaaaaaaaaa", "text", &config::now());
+        let result = write_record(&path, &record);
+        let tmp_left = path.with_extension("json.tmp").exists();
+        let _ = fs::remove_dir_all(&dir);
+        assert!(result.is_err());
+        assert!(!tmp_left);
+    }
+}
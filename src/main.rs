@@ -1,5 +1,6 @@
 use anyhow::Result;
 use clap::{Parser, Subcommand};
+use std::io::{self, Write};
 use std::process::Command;
 
 use aigpt::core::{config, reader, writer};
@@ -77,13 +78,17 @@ fn main() -> Result<()> {
         }
 
         Some(Commands::ReadMemory) => {
-            let records = reader::read_memory_all()?;
-            if records.is_empty() {
+            let files = reader::memory_files()?;
+            if files.is_empty() {
                 println!("No memory records found");
             } else {
-                for record in &records {
-                    println!("{}", serde_json::to_string_pretty(record)?);
+                let mut out = io::BufWriter::new(io::stdout().lock());
+                for path in &files {
+                    let record: serde_json::Value = reader::read_record(path)?;
+                    serde_json::to_writer_pretty(&mut out, &record)?;
+                    out.write_all(b"\n")?;
                 }
+                out.flush()?;
             }
         }
 
@@ -153,12 +158,24 @@ fn run_setup() -> Result<()> {
 }
 
 fn which_command(cmd: &str) -> Option<std::path::PathBuf> {
-    Command::new("which")
-        .arg(cmd)
-        .output()
-        .ok()
-        .filter(|o| o.status.success())
-        .map(|o| std::path::PathBuf::from(String::from_utf8_lossy(&o.stdout).trim()))
+    let paths = std::env::var_os("PATH")?;
+    let file_name = format!("{}{}", cmd, std::env::consts::EXE_SUFFIX);
+    std::env::split_paths(&paths)
+        .map(|dir| dir.join(&file_name))
+        .find(|path| is_executable(path))
+}
+
+#[cfg(unix)]
+fn is_executable(path: &std::path::Path) -> bool {
+    use std::os::unix::fs::PermissionsExt;
+    path.metadata()
+        .map(|m| m.is_file() && m.permissions().mode() & 0o111 != 0)
+        .unwrap_or(false)
+}
+
+#[cfg(not(unix))]
+fn is_executable(path: &std::path::Path) -> bool {
+    path.is_file()
 }
 
 fn is_command_available(cmd: &str) -> bool {
@@ -13,7 +13,7 @@ impl MCPServer {
 
     pub fn run(&self) -> Result<()> {
         let stdin = io::stdin();
-        let mut stdout = io::stdout();
+        let mut stdout = io::stdout().lock();
 
         let reader = stdin.lock();
         let lines = reader.lines();
@@ -21,15 +21,14 @@ impl MCPServer {
         for line_result in lines {
             match line_result {
                 Ok(line) => {
-                    let trimmed = line.trim().to_string();
+                    let trimmed = line.trim();
                     if trimmed.is_empty() {
                         continue;
                     }
 
-                    if let Ok(request) = serde_json::from_str::<Value>(&trimmed) {
+                    if let Ok(request) = serde_json::from_str::<Value>(trimmed) {
                         let response = self.handle_request(request);
-                        let response_str = serde_json::to_string(&response)?;
-                        stdout.write_all(response_str.as_bytes())?;
+                        serde_json::to_writer(&mut stdout, &response)?;
                         stdout.write_all(b"\n")?;
                         stdout.flush()?;
                     }
@@ -82,22 +81,14 @@ impl MCPServer {
     fn build_instructions(&self) -> String {
         let mut parts = Vec::new();
 
-        if let Ok(core) = reader::read_core() {
-            if let Some(text) = core["value"]["content"]["text"].as_str() {
-                if !text.is_empty() {
-                    parts.push(text.to_string());
-                }
+        if let Ok(text) = reader::read_core_text() {
+            if !text.is_empty() {
+                parts.push(text);
             }
         }
 
-        let records = reader::read_memory_all().unwrap_or_default();
-        for record in &records {
-            if let Some(text) = record["value"]["content"]["text"].as_str() {
-                if !text.is_empty() {
-                    parts.push(text.to_string());
-                }
-            }
-        }
+        let texts = reader::read_memory_texts().unwrap_or_default();
+        parts.extend(texts.into_iter().filter(|text| !text.is_empty()));
 
         parts.join("\n\n")
     }